@@ -1,8 +1,11 @@
 import pandas as pd
 import numpy as np
+from pandas.api.types import is_bool_dtype, is_numeric_dtype, is_object_dtype
 from typing import Dict, Any, List, Tuple
 from json_utils import json_to_dataframe
+from stats_utils import pearson_correlation
 import json
+import warnings
 
 
 class JSONDataAnalyzer:
@@ -17,31 +20,39 @@ class JSONDataAnalyzer:
         """
         self.json_data = json_data
         self.df = json_to_dataframe(json_data)
-        self.numeric_columns = self._get_numeric_columns()
-        self.categorical_columns = self._get_categorical_columns()
+        self.numeric_columns, self.categorical_columns = self._classify_columns()
+        # Contiguous float64 copy of the numeric columns shared by all numeric reductions
+        self._numeric_values = np.ascontiguousarray(
+            self.df[self.numeric_columns].to_numpy(dtype=np.float64, na_value=np.nan))
+        # Shallow estimate; object columns are only counted by reference
+        self._memory_usage = int(self.df.memory_usage(deep=False).sum())
+        self._deep_memory_usage = None
     
-    def _get_numeric_columns(self) -> List[str]:
-        """Get list of numeric columns in the DataFrame."""
-        return list(self.df.select_dtypes(include=[np.number]).columns)
-    
-    def _get_categorical_columns(self) -> List[str]:
-        """Get list of categorical columns in the DataFrame."""
-        # Filter out columns that contain lists or other non-hashable types
+    def _classify_columns(self) -> Tuple[List[str], List[str]]:
+        """
+        Split columns into numeric and categorical in a single pass over the dtypes.
+        
+        Returns:
+            tuple: Lists of numeric and categorical column names
+        """
+        numeric_cols = []
         categorical_cols = []
-        for col in self.df.select_dtypes(include=['object']).columns:
-            # Check if the column contains hashable values
-            try:
-                # Test with a small sample of values
-                sample_values = self.df[col].dropna().head(5)
-                for val in sample_values:
-                    if pd.notna(val):
-                        # Try to hash the value to check if it's hashable
-                        hash(val)
+        for col, dtype in self.df.dtypes.items():
+            if is_numeric_dtype(dtype) and not is_bool_dtype(dtype):
+                numeric_cols.append(col)
+            elif isinstance(dtype, (pd.CategoricalDtype, pd.StringDtype)):
+                # The dtype already guarantees hashable values
                 categorical_cols.append(col)
-            except (TypeError, ValueError):
-                # Skip columns with unhashable types like lists or other complex objects
-                continue
-        return categorical_cols
+            elif is_object_dtype(dtype) and not self._has_unhashable_values(col):
+                # Columns with lists or other complex objects are skipped
+                categorical_cols.append(col)
+        return numeric_cols, categorical_cols
+    
+    def _has_unhashable_values(self, col: str) -> bool:
+        """Check a small sample of non-null values for container types."""
+        values = self.df[col].to_numpy()
+        sample_values = values[pd.notna(values)][:5]
+        return any(isinstance(val, (list, dict, set)) for val in sample_values)
     
     def get_basic_info(self) -> Dict[str, Any]:
         """
@@ -55,10 +66,24 @@ class JSONDataAnalyzer:
             'columns': list(self.df.columns),
             'numeric_columns': self.numeric_columns,
             'categorical_columns': self.categorical_columns,
-            'memory_usage': self.df.memory_usage(deep=True).sum()
+            'memory_usage': self._memory_usage
         }
         return info
     
+    def get_deep_memory_usage(self) -> int:
+        """
+        Get the memory usage of the dataset including the Python objects it holds.
+        
+        This walks every value in object columns, so it is measured once on
+        first use and cached.
+        
+        Returns:
+            int: Memory usage in bytes
+        """
+        if self._deep_memory_usage is None:
+            self._deep_memory_usage = int(self.df.memory_usage(deep=True).sum())
+        return self._deep_memory_usage
+    
     def get_summary_statistics(self) -> pd.DataFrame:
         """
         Get summary statistics for numeric columns.
@@ -67,7 +92,28 @@ class JSONDataAnalyzer:
             pd.DataFrame: Summary statistics
         """
         if len(self.numeric_columns) > 0:
-            return self.df[self.numeric_columns].describe()
+            values = self._numeric_values
+            # Build the NaN mask once and reuse it for every reduction
+            valid = ~np.isnan(values)
+            counts = valid.sum(axis=0)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                means = np.sum(values, axis=0, where=valid) / counts
+                # Two-pass sample variance around the mean for numerical stability
+                squares = np.sum(np.square(values - means), axis=0, where=valid)
+                stds = np.sqrt(squares / (counts - 1))
+            stds[counts < 2] = np.nan
+            mins = np.min(values, axis=0, where=valid, initial=np.inf)
+            maxs = np.max(values, axis=0, where=valid, initial=-np.inf)
+            mins[counts == 0] = np.nan
+            maxs[counts == 0] = np.nan
+            with warnings.catch_warnings():
+                # All-NaN columns yield NaN quartiles, as with describe()
+                warnings.simplefilter('ignore', RuntimeWarning)
+                quartiles = np.nanpercentile(values, [25, 50, 75], axis=0)
+            stats = [counts, means, stds, mins, *quartiles, maxs]
+            return pd.DataFrame(np.array(stats, dtype=np.float64),
+                                index=['count', 'mean', 'std', 'min', '25%', '50%', '75%', 'max'],
+                                columns=self.numeric_columns)
         else:
             return pd.DataFrame()
     
@@ -81,9 +127,12 @@ class JSONDataAnalyzer:
         summary = {}
         for col in self.categorical_columns:
             try:
+                # A single value_counts pass gives both figures; on Categoricals it
+                # counts codes directly and lists unused categories with a zero count
+                value_counts = self.df[col].value_counts()
                 summary[col] = {
-                    'unique_values': self.df[col].nunique(),
-                    'top_values': self.df[col].value_counts().head(5).to_dict()
+                    'unique_values': int((value_counts > 0).sum()),
+                    'top_values': value_counts.head(5).to_dict()
                 }
             except Exception:
                 # Handle case where value_counts fails
@@ -100,15 +149,16 @@ class JSONDataAnalyzer:
         Returns:
             pd.DataFrame: Missing data information
         """
-        missing_data = self.df.isnull().sum()
-        missing_percent = 100 * missing_data / len(self.df)
-        
-        missing_df = pd.DataFrame({
-            'missing_count': missing_data,
-            'missing_percent': missing_percent
-        })
+        # Count per column so no full boolean mask of the frame is materialized
+        missing_data = np.fromiter((series.isna().sum() for _, series in self.df.items()),
+                                   dtype=np.int64, count=self.df.shape[1])
+        missing_percent = missing_data * (100.0 / max(len(self.df), 1))
         
-        return missing_df[missing_df['missing_count'] > 0]
+        has_missing = missing_data > 0
+        return pd.DataFrame({
+            'missing_count': missing_data[has_missing],
+            'missing_percent': missing_percent[has_missing]
+        }, index=self.df.columns[has_missing])
     
     def get_correlation_matrix(self) -> pd.DataFrame:
         """
@@ -118,7 +168,9 @@ class JSONDataAnalyzer:
             pd.DataFrame: Correlation matrix
         """
         if len(self.numeric_columns) > 1:
-            return self.df[self.numeric_columns].corr()
+            return pd.DataFrame(pearson_correlation(self._numeric_values),
+                                index=self.numeric_columns,
+                                columns=self.numeric_columns)
         else:
             return pd.DataFrame()
     
@@ -2,8 +2,7 @@
 Demo script showing how to use the JSON Analyzer & Visualizer programmatically
 """
 
-import json
-from json_utils import load_json_file, json_to_dataframe, get_json_structure
+from json_utils import load_json_file, json_to_dataframe, get_json_structure, format_json
 from data_analyzer import JSONDataAnalyzer
 from visualizer import JSONVisualizer
 
@@ -20,7 +19,7 @@ def demo_json_analysis(json_file_path):
     # Show JSON structure
     structure = get_json_structure(json_data)
     print("\n📋 JSON Structure:")
-    print(json.dumps(structure, indent=2))
+    print(format_json(structure))
     
     # Convert to DataFrame
     df = json_to_dataframe(json_data)
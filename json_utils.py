@@ -1,13 +1,116 @@
 import json
+import functools
+import numpy as np
 import pandas as pd
 import os
-from typing import Union, Dict, Any
+from pandas.api.types import (infer_dtype, is_bool_dtype, is_float_dtype, is_integer_dtype,
+                              is_object_dtype, is_string_dtype)
+from typing import Union, Dict, Any, Callable, List, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib parser
+    orjson = None
+
+try:
+    import ijson
+except ImportError:  # ijson is optional; large arrays are parsed in one go instead
+    ijson = None
+
+# Top-level arrays in files larger than this are streamed record by record
+STREAM_THRESHOLD = 1 * 1024 * 1024  # 1MB in bytes
+
+# Text columns with fewer distinct values than this fraction of rows become categoricals
+CATEGORY_RATIO = 0.5
+
+try:
+    import pyarrow  # noqa: F401
+    STRING_DTYPE = 'string[pyarrow]'
+except ImportError:  # pyarrow is optional; use the Python-backed string dtype
+    STRING_DTYPE = 'string'
+
+
+def _parse_json(raw: bytes) -> Union[Dict[str, Any], list]:
+    """Parse raw JSON bytes, preferring orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _check_size(file_size: int) -> None:
+    """Raise ValueError if the data exceeds the 5MB limit."""
+    max_size = 5 * 1024 * 1024  # 5MB in bytes
+    if file_size > max_size:
+        raise ValueError(f"File size exceeds 5MB limit. File size: {file_size / (1024*1024):.2f}MB")
+
+
+@functools.lru_cache(maxsize=8)
+def _load_json_cached(file_path: str, mtime_ns: int, size: int) -> Union[Dict[str, Any], list]:
+    """
+    Read and parse a JSON file, memoized on (path, mtime, size).
+
+    The modification time and size are part of the key so that a file which
+    changes on disk is parsed again instead of served from the cache.
+    """
+    with open(file_path, 'rb') as file:
+        if ijson is not None and size > STREAM_THRESHOLD and _starts_with_array(file):
+            return _stream_json_array(file)
+        return load_json_bytes(file.read())
+
+
+def _starts_with_array(file) -> bool:
+    """Check whether a binary file's first non-whitespace byte is '['."""
+    head = file.read(1024).lstrip()
+    file.seek(0)
+    return head[:1] == b'['
+
+
+def _stream_json_array(file) -> list:
+    """
+    Parse a top-level JSON array incrementally with ijson.
+    
+    Only one record is tokenized at a time, so the raw file contents are
+    never held in memory alongside the parsed objects. Anything ijson
+    rejects, such as integers wider than 64 bits in the C backend, is parsed
+    again in memory, so large and small files give the same result or error.
+    """
+    try:
+        return list(ijson.items(file, 'item', use_float=True))
+    except ijson.JSONError:
+        file.seek(0)
+        return load_json_bytes(file.read())
+
+
+def load_json_bytes(data: bytes) -> Union[Dict[str, Any], list]:
+    """
+    Load JSON data from bytes already in memory, such as an uploaded file.
+    
+    Args:
+        data (bytes): Raw JSON content
+        
+    Returns:
+        dict or list: Parsed JSON data
+        
+    Raises:
+        ValueError: If the data exceeds the 5MB limit
+        json.JSONDecodeError: If the data is not valid JSON
+    """
+    _check_size(len(data))
+    try:
+        return _parse_json(data)
+    except json.JSONDecodeError as e:
+        # orjson.JSONDecodeError subclasses json.JSONDecodeError
+        raise json.JSONDecodeError(f"Invalid JSON format: {str(e)}", e.doc, e.pos)
 
 
 def load_json_file(file_path: str) -> Union[Dict[str, Any], list]:
     """
     Load JSON data from a file.
     
+    Parsed results are cached per (path, mtime, size), so validating and then
+    loading the same file only parses it once. Callers should treat the
+    returned object as read-only.
+    
     Args:
         file_path (str): Path to the JSON file
         
@@ -21,87 +124,342 @@ def load_json_file(file_path: str) -> Union[Dict[str, Any], list]:
     if not os.path.exists(file_path):
         raise FileNotFoundError(f"File not found: {file_path}")
     
-    # Check file size (5MB limit)
-    file_size = os.path.getsize(file_path)
-    max_size = 5 * 1024 * 1024  # 5MB in bytes
-    if file_size > max_size:
-        raise ValueError(f"File size exceeds 5MB limit. File size: {file_size / (1024*1024):.2f}MB")
+    # Check file size (5MB limit) before reading anything
+    stat = os.stat(file_path)
+    _check_size(stat.st_size)
+    
+    return _load_json_cached(file_path, stat.st_mtime_ns, stat.st_size)
+
+
+def _flatten(data: Dict[str, Any], prefix: str, out: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Flatten a nested dictionary into ``out`` using dot-separated keys.
+    
+    Args:
+        data (dict): Nested dictionary to flatten
+        prefix (str): Key of the enclosing dictionary
+        out (dict): Dictionary the flattened keys are written into
+        
+    Returns:
+        dict: The ``out`` dictionary
+    """
+    for key, value in data.items():
+        if isinstance(value, dict):
+            _flatten(value, f"{prefix}.{key}", out)
+        else:
+            out[f"{prefix}.{key}"] = value
+    return out
+
+
+def _flatten_record(record: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Flatten a single JSON object into one row.
+    
+    Top-level scalar keys come first, followed by the flattened nested keys,
+    which matches the column order produced by pd.json_normalize.
+    """
+    flat = {key: value for key, value in record.items() if not isinstance(value, dict)}
+    if len(flat) == len(record):
+        # Already flat, nothing to do
+        return flat
+    for key, value in record.items():
+        if isinstance(value, dict):
+            _flatten(value, key, flat)
+    return flat
+
+
+def _compile_row_getter(record: Dict[str, Any]) -> Optional[Tuple[List[str], Callable]]:
+    """
+    Generate a row function specialized for the shape of one record.
+    
+    The generated function reads every leaf value of a record with the same
+    shape through straight-line subscripts and returns them as a tuple, in
+    the column order of _flatten_record. It raises KeyError when a record's
+    keys differ from the template, and TypeError when a nested object is
+    missing.
+    
+    Args:
+        record (dict): Template record
+        
+    Returns:
+        tuple or None: Column names and row function, or None if the
+        flattened column names are not unique
+    """
+    columns = []
+    values = []
+    checks = [f"len(d) == {len(record)}"]
+    
+    def visit(data: Dict[str, Any], prefix: str, expr: str):
+        # Same traversal order as _flatten
+        checks.append(f"len({expr}) == {len(data)}")
+        for key, value in data.items():
+            item = f"{expr}[{key!r}]"
+            if isinstance(value, dict):
+                visit(value, f"{prefix}.{key}", item)
+            else:
+                columns.append(f"{prefix}.{key}")
+                values.append(item)
+    
+    for key, value in record.items():
+        if not isinstance(value, dict):
+            columns.append(key)
+            values.append(f"d[{key!r}]")
+    for key, value in record.items():
+        if isinstance(value, dict):
+            visit(value, key, f"d[{key!r}]")
+    if len(set(columns)) != len(columns):
+        return None
     
-    with open(file_path, 'r', encoding='utf-8') as file:
+    source = (
+        "def row(d):\n"
+        f"    if not ({' and '.join(checks)}):\n"
+        "        raise KeyError('record shape differs from template')\n"
+        f"    return ({''.join(value + ', ' for value in values)})\n"
+    )
+    namespace = {}
+    exec(source, namespace)
+    return columns, namespace['row']
+
+
+def _has_nested_values(df: pd.DataFrame) -> bool:
+    """Check whether any object column holds a dict, i.e. was not fully flattened."""
+    for col, dtype in df.dtypes.items():
+        if dtype == object and any(type(value) is dict for value in df[col].to_numpy()):
+            return True
+    return False
+
+
+def _records_to_dataframe(records: List[Dict[str, Any]]) -> pd.DataFrame:
+    """
+    Convert a list of JSON objects to a DataFrame.
+    
+    Lists of records usually share one shape, so a row function specialized
+    for the first record is tried first. If any record has a different
+    shape, every record is flattened generically instead.
+    """
+    compiled = _compile_row_getter(records[0]) if records else None
+    if compiled is not None:
+        columns, row = compiled
         try:
-            data = json.load(file)
-            return data
-        except json.JSONDecodeError as e:
-            raise json.JSONDecodeError(f"Invalid JSON format: {str(e)}", e.doc, e.pos)
+            df = pd.DataFrame([row(record) for record in records], columns=columns)
+        except (KeyError, TypeError):
+            df = None
+        # A dict where the template had a scalar is not caught by the shape check
+        if df is not None and not _has_nested_values(df):
+            return df
+    return pd.DataFrame([_flatten_record(record) for record in records])
+
+
+def _downcast_integers(values: np.ndarray) -> List[np.ndarray]:
+    """
+    Downcast each column of a 2D signed integer array to the smallest type holding it.
+    
+    Args:
+        values (np.ndarray): 2D integer array with one column per DataFrame column
+        
+    Returns:
+        list: One 1D array per column
+    """
+    lows, highs = values.min(axis=0), values.max(axis=0)
+    columns = []
+    for j in range(values.shape[1]):
+        target = values.dtype
+        for candidate in (np.int8, np.int16, np.int32):
+            info = np.iinfo(candidate)
+            if info.min <= lows[j] and highs[j] <= info.max:
+                target = candidate
+                break
+        columns.append(values[:, j].astype(target))
+    return columns
+
+
+def _optimize_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Shrink the memory footprint of a DataFrame.
+    
+    Integer columns are downcast to the smallest integer type that holds
+    their values and float columns to float32 where that is lossless.
+    Text columns with few distinct values relative to the row count are
+    converted to pandas Categoricals, with categories in order of first
+    appearance, and the remaining object columns that hold only strings to
+    the pandas string dtype.
+    
+    Columns are read as one 2D array per dtype and the converted ones are
+    put back with a single concat, since per-column pandas calls and
+    assignments dominate the cost on wide frames.
+    
+    Args:
+        df (pd.DataFrame): DataFrame to optimize
+        
+    Returns:
+        pd.DataFrame: DataFrame with optimized dtypes
+    """
+    n_rows, n_cols = df.shape
+    if not n_rows:
+        return df
+    positions_by_dtype = {}
+    for i, dtype in enumerate(df.dtypes):
+        positions_by_dtype.setdefault(dtype, []).append(i)
+        
+    converted = {}
+    category_dtypes = {}
+    for dtype, positions in positions_by_dtype.items():
+        if is_bool_dtype(dtype):
+            continue
+        if is_integer_dtype(dtype) and isinstance(dtype, np.dtype) and dtype.kind == 'i':
+            columns = _downcast_integers(df.iloc[:, positions].to_numpy())
+            for i, column in zip(positions, columns):
+                if column.dtype != dtype:
+                    converted[i] = column
+        elif dtype == np.float64:
+            values = df.iloc[:, positions].to_numpy()
+            with np.errstate(over='ignore'):
+                downcast = values.astype(np.float32)
+            # Lossless when every value survives the round trip (NaN stays NaN)
+            lossless = ((downcast == values) | np.isnan(values)).all(axis=0)
+            for j in np.flatnonzero(lossless):
+                converted[positions[j]] = downcast[:, j]
+        elif is_integer_dtype(dtype) or is_float_dtype(dtype):
+            # Nullable and unsigned types are rare here; convert them one by one
+            for i in positions:
+                series = df.iloc[:, i]
+                downcast = pd.to_numeric(series, downcast='integer' if is_integer_dtype(dtype) else 'float')
+                if downcast.dtype != dtype and np.array_equal(downcast.to_numpy(np.float64, na_value=np.nan),
+                                                              series.to_numpy(np.float64, na_value=np.nan),
+                                                              equal_nan=True):
+                    converted[i] = downcast.array
+        elif is_string_dtype(dtype):
+            values = df.iloc[:, positions].to_numpy(dtype=object)
+            for j, i in enumerate(positions):
+                column = values[:, j]
+                try:
+                    codes, uniques = pd.factorize(column)
+                except TypeError:
+                    # Lists and other unhashable values cannot be categorical
+                    continue
+                if len(uniques) / n_rows < CATEGORY_RATIO:
+                    # factorize keeps first-appearance order, so value count ties stay in that order.
+                    # Columns with the same categories share one dtype, which is validated only once;
+                    # types are part of the key because 1, 1.0 and True hash alike.
+                    key = (tuple(uniques), tuple(map(type, uniques)))
+                    if key not in category_dtypes:
+                        category_dtypes[key] = pd.CategoricalDtype(uniques)
+                    converted[i] = pd.Categorical.from_codes(codes, dtype=category_dtypes[key])
+                elif is_object_dtype(dtype) and infer_dtype(column, skipna=True) == 'string':
+                    converted[i] = pd.array(column, dtype=STRING_DTYPE)
+                    
+    if not converted:
+        return df
+    unchanged = [i for i in range(n_cols) if i not in converted]
+    # Positional labels keep duplicate column names apart until the end
+    result = pd.concat([df.iloc[:, unchanged].set_axis(unchanged, axis=1),
+                        pd.DataFrame(converted, index=df.index)], axis=1)
+    result = result.loc[:, list(range(n_cols))]
+    result.columns = df.columns
+    return result
 
 
 def json_to_dataframe(json_data: Union[Dict[str, Any], list]) -> pd.DataFrame:
     """
     Convert JSON data to a pandas DataFrame.
     
+    Objects and lists of objects are flattened directly and passed to a single
+    DataFrame constructor, which is much faster than pd.json_normalize. Any
+    other shape falls back to pd.json_normalize. Column dtypes are narrowed
+    afterwards to reduce memory usage.
+    
     Args:
         json_data (dict or list): JSON data to convert
         
     Returns:
         pd.DataFrame: DataFrame representation of the JSON data
     """
+    df = None
     try:
-        # If it's a dictionary with nested data, we might need to normalize it
         if isinstance(json_data, dict):
-            # Check if it's a simple dict or a nested structure
-            df = pd.json_normalize(json_data)
-        else:
-            # If it's a list, convert directly
+            df = pd.DataFrame([_flatten_record(json_data)])
+        elif isinstance(json_data, list) and all(isinstance(record, dict) for record in json_data):
+            df = _records_to_dataframe(json_data)
+    except Exception:
+        # Let pd.json_normalize handle anything the fast path cannot
+        df = None
+    
+    if df is None:
+        try:
             df = pd.json_normalize(json_data)
-        return df
-    except Exception as e:
-        raise ValueError(f"Could not convert JSON to DataFrame: {str(e)}")
+        except Exception as e:
+            raise ValueError(f"Could not convert JSON to DataFrame: {str(e)}")
+    
+    return _optimize_dtypes(df)
 
 
-def get_json_structure(data: Union[Dict, list], path: str = "") -> dict:
+def _object_node(data: Dict[str, Any], stack: list) -> dict:
+    """Create the structure node for an object and queue its properties."""
+    node = {'type': 'object', 'properties': {}, 'size': len(data)}
+    stack.append((data, node['properties']))
+    return node
+
+
+def get_json_structure(data: Union[Dict, list]) -> dict:
     """
     Analyze the structure of JSON data.
     
+    The data is walked iteratively with an explicit stack rather than by
+    recursion, so deeply nested documents stay cheap to describe.
+    
     Args:
         data (dict or list): JSON data to analyze
-        path (str): Current path in the JSON structure (for recursion)
         
     Returns:
         dict: Structure information of the JSON data
     """
-    structure = {}
+    stack = []
     
-    if isinstance(data, dict):
-        structure['type'] = 'object'
-        structure['properties'] = {}
-        structure['size'] = len(data)
-        
-        for key, value in data.items():
-            current_path = f"{path}.{key}" if path else key
-            if isinstance(value, dict):
-                structure['properties'][key] = get_json_structure(value, current_path)
-            elif isinstance(value, list):
-                structure['properties'][key] = {'type': 'array', 'size': len(value)}
-                if len(value) > 0 and isinstance(value[0], dict):
-                    structure['properties'][key]['items'] = get_json_structure(value[0], current_path + "[0]")
+    if type(data) is dict:
+        structure = _object_node(data, stack)
+    elif type(data) is list:
+        structure = {'type': 'array', 'size': len(data)}
+        if data:
+            first = data[0]
+            if type(first) is dict:
+                structure['items'] = _object_node(first, stack)
             else:
-                structure['properties'][key] = {'type': type(value).__name__}
-                
-    elif isinstance(data, list):
-        structure['type'] = 'array'
-        structure['size'] = len(data)
-        if len(data) > 0:
-            if isinstance(data[0], dict):
-                structure['items'] = get_json_structure(data[0], path + "[0]")
-            else:
-                structure['items'] = {'type': type(data[0]).__name__}
-                
+                structure['items'] = {'type': type(first).__name__}
     else:
-        structure['type'] = type(data).__name__
-        
+        structure = {'type': type(data).__name__}
+    
+    while stack:
+        obj, properties = stack.pop()
+        for key, value in obj.items():
+            value_type = type(value)
+            if value_type is dict:
+                properties[key] = _object_node(value, stack)
+            elif value_type is list:
+                node = {'type': 'array', 'size': len(value)}
+                if value and type(value[0]) is dict:
+                    node['items'] = _object_node(value[0], stack)
+                properties[key] = node
+            else:
+                properties[key] = {'type': value_type.__name__}
+    
     return structure
 
 
+def format_json(data: Union[Dict[str, Any], list]) -> str:
+    """
+    Pretty-print JSON data with two-space indentation.
+    
+    Args:
+        data (dict or list): JSON data to format
+        
+    Returns:
+        str: Indented JSON text
+    """
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode('utf-8')
+    return json.dumps(data, indent=2)
+
+
 def validate_json_format(file_path: str) -> bool:
     """
     Validate if a file contains valid JSON.
@@ -0,0 +1,91 @@
+import numpy as np
+import warnings
+
+
+def _dense_correlation(values: np.ndarray, dtype) -> np.ndarray:
+    """
+    Compute the Pearson correlation matrix of the columns of a NaN-free array.
+    
+    Columns are centered in float64 and written straight into a buffer of
+    the requested dtype, so no extra copy of the data is made. The covariance
+    is a single BLAS product into a preallocated matrix; NumPy recognizes the
+    X.T @ X pattern and uses syrk, which computes one triangle and mirrors
+    it. The result is normalized in place by the square root of its diagonal
+    instead of dividing by an outer product of the standard deviations.
+    
+    Args:
+        values (np.ndarray): 2D float array with one variable per column
+        dtype: Float dtype of the computation and result
+        
+    Returns:
+        np.ndarray: Correlation matrix; NaN for constant columns
+    """
+    centered = np.empty(values.shape, dtype=dtype)
+    np.subtract(values, values.mean(axis=0), out=centered, casting='same_kind')
+    corr = np.empty((values.shape[1], values.shape[1]), dtype=dtype)
+    np.matmul(centered.T, centered, out=corr)
+    std = np.sqrt(np.diag(corr))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        corr /= std
+        corr /= std[:, None]
+    np.clip(corr, -1.0, 1.0, out=corr)
+    np.fill_diagonal(corr, np.where(std > 0, 1.0, np.nan))
+    return corr
+
+
+def _pairwise_correlation(values: np.ndarray, dtype) -> np.ndarray:
+    """
+    Compute pairwise-complete Pearson correlations of an array with NaNs.
+    
+    For every pair of columns only the rows where both are present are used,
+    as in DataFrame.corr(). The pair counts, sums, sums of squares and cross
+    products are each one matrix product over the zero-filled data and its
+    validity mask, instead of a Python-level loop over column pairs. Columns
+    are centered on their own mean first to avoid cancellation, and the sums
+    are always taken in float64.
+    
+    Args:
+        values (np.ndarray): 2D float array with one variable per column
+        dtype: Float dtype of the result
+        
+    Returns:
+        np.ndarray: Correlation matrix; NaN where a pair has fewer than two
+            rows in common or no variance
+    """
+    valid = ~np.isnan(values)
+    mask = valid.astype(np.float64)
+    with warnings.catch_warnings():
+        # All-NaN columns have no mean; they come out as NaN correlations below
+        warnings.simplefilter('ignore', RuntimeWarning)
+        means = np.nanmean(values, axis=0)
+    centered = np.where(valid, values - means, 0.0)
+    count = mask.T @ mask
+    sums = centered.T @ mask  # sums[i, j]: sum of column i over rows where j is present
+    sumsq = (centered * centered).T @ mask
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cov = centered.T @ centered - sums * sums.T / count
+        var = sumsq - sums * sums / count
+        corr = cov / np.sqrt(var * var.T)
+    corr[(count < 2) | ~(var > 0) | ~(var.T > 0)] = np.nan
+    np.clip(corr, -1.0, 1.0, out=corr)
+    return corr.astype(dtype, copy=False)
+
+
+def pearson_correlation(values: np.ndarray, dtype=np.float64) -> np.ndarray:
+    """
+    Compute the Pearson correlation matrix of the columns of a 2D array.
+    
+    Gives the same result as DataFrame.corr(): when values are missing, each
+    pair of columns is correlated over the rows where both are present.
+    
+    Args:
+        values (np.ndarray): 2D float array with one variable per column;
+            missing values are NaN
+        dtype: Float dtype of the result; float32 is enough for display
+        
+    Returns:
+        np.ndarray: Correlation matrix
+    """
+    if np.isnan(values).any():
+        return _pairwise_correlation(values, dtype)
+    return _dense_correlation(values, dtype)
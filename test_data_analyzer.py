@@ -1,4 +1,6 @@
 import json
+import numpy as np
+import pandas as pd
 from json_utils import load_json_file, json_to_dataframe
 from data_analyzer import JSONDataAnalyzer
 
@@ -22,6 +24,7 @@ def test_data_analyzer():
         print(f"Numeric columns: {info['numeric_columns']}")
         print(f"Categorical columns: {info['categorical_columns']}")
         print(f"Memory usage: {info['memory_usage']} bytes")
+        print(f"Deep memory usage: {analyzer.get_deep_memory_usage()} bytes")
         
         # Get summary statistics
         summary_stats = analyzer.get_summary_statistics()
@@ -62,5 +65,29 @@ def test_data_analyzer():
         return False
 
 
+
+def test_summary_statistics_match_describe():
+    """The NumPy summary statistics match DataFrame.describe()."""
+    rng = np.random.default_rng(3)
+    records = [
+        {
+            'values': float(rng.normal()),
+            'with_gaps': None if i % 4 == 0 else int(rng.integers(0, 100)),
+            'all_missing': float('nan'),
+            'single_value': 7.5 if i == 3 else None,
+            'large': 1e9 + i * 0.5,
+            'label': 'x',
+        }
+        for i in range(40)
+    ]
+    analyzer = JSONDataAnalyzer(records)
+    
+    summary = analyzer.get_summary_statistics()
+    expected = analyzer.df[analyzer.numeric_columns].describe()
+    # describe() reduces float32 columns in float32, the analyzer in float64
+    pd.testing.assert_frame_equal(summary, expected, check_dtype=False, rtol=1e-6)
+    print("✅ Summary statistics match describe()")
+
+
 if __name__ == "__main__":
     test_data_analyzer()
\ No newline at end of file
@@ -1,5 +1,8 @@
 import json
-from json_utils import load_json_file, json_to_dataframe, get_json_structure
+import os
+import tempfile
+import pandas as pd
+from json_utils import STREAM_THRESHOLD, load_json_file, load_json_bytes, json_to_dataframe, get_json_structure
 
 
 def test_json_utils():
@@ -11,6 +14,11 @@ def test_json_utils():
         print(f"Data type: {type(json_data)}")
         print(f"Keys: {list(json_data.keys()) if isinstance(json_data, dict) else 'N/A'}")
         
+        # Load the same data from bytes in memory
+        with open("sample_data.json", "rb") as file:
+            bytes_data = load_json_bytes(file.read())
+        print(f"✅ Successfully loaded JSON bytes (matches file: {bytes_data == json_data})")
+        
         # Get JSON structure
         structure = get_json_structure(json_data)
         print("\n✅ JSON Structure:")
@@ -30,5 +38,70 @@ def test_json_utils():
         return False
 
 
+def test_json_to_dataframe_matches_json_normalize():
+    """The specialized record flattening gives the same frame as pandas."""
+    cases = {
+        'nested records': [
+            {'id': i, 'name': f'user{i}', 'info': {'age': 20 + i, 'city': {'name': 'Oslo', 'zip': str(i)}}}
+            for i in range(5)
+        ],
+        'missing key': [{'a': 1, 'b': {'c': 2}}, {'a': 2}],
+        'extra key': [{'a': 1}, {'a': 2, 'b': {'c': 3}, 'd': 'x'}],
+        'scalar becomes dict': [{'a': 1, 'b': 2}, {'a': 2, 'b': {'c': 3}}],
+        'empty nested dict': [{'a': 1, 'b': {}}, {'a': 2, 'b': {}}],
+        'key collision': [{'a.b': 1, 'a': {'b': 2}}],
+    }
+    for name, records in cases.items():
+        df = json_to_dataframe(records)
+        expected = pd.json_normalize(records)
+        # Values and column order must match; dtypes are optimized separately
+        pd.testing.assert_frame_equal(df.astype(object), expected.astype(object),
+                                      check_dtype=False, obj=name)
+        print(f"✅ {name} matches json_normalize")
+
+
+def test_optimize_dtypes():
+    """Narrowed dtypes keep values, and categories keep first-appearance order."""
+    records = [{'n': i % 3, 'x': i / 2, 'name': f'user{2 - i % 3}', 'dept': f'd{i % 2}'} for i in range(60)]
+    df = json_to_dataframe(records)
+    expected = pd.json_normalize(records)
+    assert str(df['n'].dtype) == 'int8'
+    assert str(df['x'].dtype) == 'float32'
+    assert isinstance(df['name'].dtype, pd.CategoricalDtype)
+    assert list(df['name'].cat.categories) == ['user2', 'user1', 'user0']
+    # Each column keeps its own categories
+    assert list(df['dept'].cat.categories) == ['d0', 'd1']
+    pd.testing.assert_frame_equal(df.astype(object), expected.astype(object), check_dtype=False)
+    # Ties in the value counts stay in order of first appearance, as without categoricals
+    assert list(df['name'].value_counts().index) == list(expected['name'].value_counts().index)
+    print("✅ Optimized dtypes keep values and category order")
+
+
+def _load_or_error(load, source):
+    """Return the parsed JSON, or the decode error message."""
+    try:
+        return load(source)
+    except json.JSONDecodeError as e:
+        return f"JSONDecodeError: {e}"
+
+
+def test_stream_matches_bytes():
+    """Files large enough to be streamed parse the same as bytes in memory."""
+    records = [{'id': i, 'value': i / 4, 'name': f'user{i}', 'tags': ['a', None]} for i in range(20000)]
+    cases = {
+        'records': json.dumps(records).encode(),
+        'big integer': json.dumps(records + [{'id': 2 ** 70}]).encode(),
+        'invalid': json.dumps(records).encode()[:-1],
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, raw in cases.items():
+            assert len(raw) > STREAM_THRESHOLD
+            path = os.path.join(tmp, f"{name}.json")
+            with open(path, 'wb') as file:
+                file.write(raw)
+            assert _load_or_error(load_json_file, path) == _load_or_error(load_json_bytes, raw), name
+            print(f"✅ Streamed {name} matches bytes")
+
+
 if __name__ == "__main__":
     test_json_utils()
\ No newline at end of file
@@ -1,6 +1,8 @@
+import numpy as np
 import pandas as pd
 from json_utils import load_json_file, json_to_dataframe
-from visualizer import JSONVisualizer
+from visualizer import JSONVisualizer, _box_stats, _top_counts
+from stats_utils import pearson_correlation
 import plotly.graph_objects as go
 
 
@@ -51,5 +53,139 @@ def test_visualizer():
         return False
 
 
+def test_float_precision():
+    """Float columns are only sent as float32 when no plotted value moves."""
+    timestamps = 1700000000.25 + 10 * np.arange(100)
+    prices = 12345678.91 + 0.01 * np.arange(100)
+    df = pd.DataFrame({'time': timestamps, 'price': prices, 'ratio': np.linspace(0, 1, 100)})
+    visualizer = JSONVisualizer(df)
+    
+    x = np.asarray(visualizer.create_scatter_plot('time', 'ratio').data[0].x)
+    assert len(np.unique(x)) == 100
+    
+    y = np.asarray(visualizer.create_line_chart('time', 'price').data[0].y)
+    assert np.array_equal(y, prices)
+    
+    # Plain fractions survive the conversion and are halved in size
+    ratio = np.asarray(visualizer.create_line_chart('time', 'ratio').data[0].y)
+    assert ratio.dtype == np.float32
+    print("✅ Float precision preserved")
+
+
+def test_scatter_missing_colour():
+    """Rows without a colour value get no trace or legend entry of their own."""
+    df = pd.DataFrame({'x': [1.0, 2.0, 3.0, 4.0], 'y': [4.0, 3.0, 2.0, 1.0],
+                       'group': ['a', None, 'b', 'a']})
+    fig = JSONVisualizer(df).create_scatter_plot('x', 'y', 'group')
+    
+    assert [trace.name for trace in fig.data] == ['a', 'b']
+    assert list(fig.data[0].x) == [1.0, 4.0] and list(fig.data[1].x) == [3.0]
+    print("✅ Missing colour values are left out")
+
+
+def test_integer_histogram():
+    """Integer columns get one bin per value instead of bins between integers."""
+    df = pd.DataFrame({'rating': np.array([0, 1, 1, 2, 3, 3, 3] * 10, dtype=np.int8)})
+    bar = JSONVisualizer(df).create_histogram('rating').data[0]
+    
+    assert list(bar.x) == [0, 1, 2, 3]
+    assert list(bar.y) == [10, 20, 10, 30]
+    assert np.allclose(bar.width, 1)
+    print("✅ Integer histogram bins are aligned")
+
+
+def test_figure_cache():
+    """Cached figures are copies, so callers cannot change each other's plots."""
+    visualizer = JSONVisualizer(pd.DataFrame({'value': np.arange(50.0)}))
+    
+    visualizer.create_histogram('value').update_layout(title_text='changed')
+    assert visualizer.create_histogram('value').layout.title.text == 'Distribution of value'
+    print("✅ Cached figures are isolated")
+
+
+def test_nan_correlation():
+    """Heatmap correlations with missing values match DataFrame.corr()."""
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(rng.normal(size=(500, 5)), columns=list('abcde'))
+    df['b'] = df['a'] * 2 + rng.normal(size=500)
+    df = df.mask(rng.random(df.shape) < 0.2)
+    df['constant'] = 3.0
+    df['sparse'] = np.nan
+    df.loc[0, 'sparse'] = 1.0
+    
+    expected = df.corr().to_numpy()
+    corr = pearson_correlation(df.to_numpy(), dtype=np.float32)
+    assert np.array_equal(np.isnan(corr), np.isnan(expected))
+    assert np.allclose(corr, expected, atol=1e-6, equal_nan=True)
+    
+    z = np.asarray(JSONVisualizer(df).create_correlation_heatmap().data[0].z)
+    assert np.allclose(z, expected, atol=1e-6, equal_nan=True)
+    print("✅ NaN-aware correlation matches pandas")
+
+
+def _plotly_interp(values, p):
+    """Port of Plotly.js Lib.interp, used for its default 'linear' quartiles."""
+    position = p * len(values) - 0.5
+    if position < 0:
+        return values[0]
+    if position > len(values) - 1:
+        return values[-1]
+    fraction = position % 1
+    return fraction * values[int(np.ceil(position))] + (1 - fraction) * values[int(np.floor(position))]
+
+
+def test_box_stats():
+    """Precomputed box statistics match quartiles and fences computed directly."""
+    rng = np.random.default_rng(1)
+    groups = {'a': rng.standard_t(3, 300), 'b': np.r_[rng.normal(size=50), 25.0, -30.0],
+              'c': np.array([4.0, 4.0, 9.0]), 'd': np.array([1.0, 2.0, 3.0, 4.0, 10.0]),
+              'e': np.array([4.0])}
+    
+    for values in groups.values():
+        values = np.sort(values)
+        q1, median, q3 = (_plotly_interp(values, p) for p in (0.25, 0.5, 0.75))
+        iqr = q3 - q1
+        inside = [v for v in values if q1 - 1.5 * iqr <= v <= q3 + 1.5 * iqr]
+        outside = sorted(v for v in values if v < q1 - 1.5 * iqr or v > q3 + 1.5 * iqr)
+        
+        stats, outliers = _box_stats(values)
+        assert np.allclose(stats, [q1, median, q3, min(inside), max(inside)])
+        assert np.array_equal(np.sort(outliers), outside)
+        
+    # Plotly draws [1, 2, 3, 4, 10] with Q1=1.75, Q3=5.5 and no outliers
+    stats, outliers = _box_stats(groups['d'])
+    assert np.allclose(stats, [1.75, 3.0, 5.5, 1.0, 10.0]) and outliers.size == 0
+    
+    # Grouped plots give the same statistics per group
+    df = pd.DataFrame({'group': np.repeat(list(groups), [len(v) for v in groups.values()]),
+                       'value': np.concatenate(list(groups.values()))})
+    box = JSONVisualizer(df).create_box_plot('value', 'group').data[0]
+    assert list(box.x) == list(groups)
+    for i, values in enumerate(groups.values()):
+        stats, _ = _box_stats(np.sort(values))
+        assert np.allclose([box.q1[i], box.median[i], box.q3[i], box.lowerfence[i], box.upperfence[i]], stats)
+    print("✅ Box statistics match")
+
+
+def test_top_counts():
+    """Top-k counts for bar and pie charts match value_counts().head(k)."""
+    rng = np.random.default_rng(2)
+    columns = {
+        'integers': pd.Series(rng.integers(0, 100, 5000)),
+        'ties': pd.Series(['b', 'a', 'b', 'a', 'c', 'd', 'c', None]),
+        'repeated': pd.Series([f'user{i % 50}' for i in range(3000)]),
+        'categorical': pd.Series(rng.choice(list('abcdefghij'), 3000)).astype('category'),
+        'unused categories': pd.Series(pd.Categorical(['a', 'b', 'a', None], categories=['z', 'b', 'a', 'q'])),
+        'empty': pd.Series([], dtype=object),
+    }
+    for name, series in columns.items():
+        for k in (1, 3, 20):
+            values, counts = _top_counts(series, k)
+            expected = series.value_counts().head(k)
+            assert list(values) == list(expected.index), (name, k)
+            assert list(counts) == list(expected.to_numpy()), (name, k)
+    print("✅ Top-k counts match value_counts")
+
+
 if __name__ == "__main__":
     test_visualizer()
\ No newline at end of file
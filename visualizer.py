@@ -1,8 +1,258 @@
-import plotly.express as px
+import copy
+import functools
+import threading
+from collections import OrderedDict
 import plotly.graph_objects as go
 import pandas as pd
-from typing import Dict, Any, List, Optional
+from pandas.api.types import is_bool_dtype, is_float_dtype, is_integer_dtype, is_numeric_dtype
+from typing import Dict, Any, List, Optional, Tuple
 import numpy as np
+from stats_utils import pearson_correlation
+
+
+# Upper bound on histogram bins; numpy's 'auto' rule can ask for millions
+# when a few outliers stretch the range of a column
+MAX_HISTOGRAM_BINS = 200
+
+# Scatter and line traces with more points than this are drawn with WebGL
+WEBGL_THRESHOLD = 4000
+
+# Scatter and line charts draw a random sample of this many rows at most
+MAX_POINTS = 50_000
+
+# Correlation heatmaps with more columns than this are drawn without cell labels
+HEATMAP_TEXT_LIMIT = 20
+
+# Largest float32 rounding error, as a fraction of a column's range, that is
+# accepted when demoting float64 plot data; beyond it points would visibly move
+DISPLAY_TOLERANCE = 1e-6
+
+# Number of figures each visualizer keeps for repeated plot calls
+FIGURE_CACHE_SIZE = 32
+
+
+def _hashable(value: Any) -> Any:
+    """Turn list arguments (e.g. heatmap columns) into tuples for use in cache keys."""
+    if isinstance(value, (list, tuple)):
+        return tuple(_hashable(item) for item in value)
+    return value
+
+
+def _copy_figure(fig: go.Figure) -> go.Figure:
+    """
+    Copy a figure built by _figure without re-validating it.
+    
+    This is what Figure.to_dict() does before it base64-encodes the arrays,
+    which would leave the copy holding encoded dicts instead of NumPy arrays.
+    """
+    return go.Figure({'data': copy.deepcopy(fig._data), 'layout': copy.deepcopy(fig._layout)},
+                     _validate=False)
+
+
+def _cached_figure(method):
+    """
+    Memoize a create_* method on its arguments.
+    
+    Figures are kept in the instance's LRU cache until refresh() is called,
+    so re-rendering the same plot skips binning, correlation and figure
+    construction entirely. Callers get their own copy, since figures are
+    mutable and a visualizer may be shared between sessions and threads;
+    the cache itself is guarded by the instance's lock.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        key = (id(self.df), self._df_version, method.__name__,
+               _hashable(args), _hashable(tuple(sorted(kwargs.items()))))
+        cache = self._fig_cache
+        with self._fig_lock:
+            fig = cache.get(key)
+            if fig is not None:
+                cache.move_to_end(key)
+        if fig is None:
+            fig = method(self, *args, **kwargs)
+            with self._fig_lock:
+                cache[key] = fig
+                cache.move_to_end(key)
+                if len(cache) > FIGURE_CACHE_SIZE:
+                    cache.popitem(last=False)
+        return _copy_figure(fig)
+    return wrapper
+
+
+def _figure(data: List[Dict[str, Any]], layout: Dict[str, Any]) -> go.Figure:
+    """
+    Build a figure from plain trace and layout dicts.
+    
+    Property validation is skipped; it dominates the cost of building
+    figures through plotly.express or validated graph objects. Trace data
+    should be NumPy arrays rather than lists or Series, so that numeric
+    arrays are serialized as base64 typed arrays instead of JSON numbers.
+    """
+    return go.Figure({'data': data, 'layout': layout}, _validate=False)
+
+
+def _histogram_bin_count(values: np.ndarray) -> int:
+    """Number of bins chosen by numpy's 'auto' rule, capped at MAX_HISTOGRAM_BINS."""
+    if values.size < 2:
+        return 1
+    sturges = np.log2(values.size) + 1
+    q75, q25 = np.percentile(values, [75, 25])
+    iqr = q75 - q25
+    fd = np.ptp(values) / (2 * iqr * values.size ** (-1 / 3)) if iqr > 0 else 0
+    return int(np.ceil(min(max(sturges, fd), MAX_HISTOGRAM_BINS)))
+
+
+def _topk_counts(codes: np.ndarray, n_cats: int, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Count integer codes and return the k most frequent.
+    
+    Counting is a single np.bincount and only the top k counts are sorted,
+    found with np.partition, rather than every distinct value as
+    value_counts() does. Negative codes mark missing values and are
+    ignored; ties keep the lower code first.
+    
+    Args:
+        codes (np.ndarray): Integer codes in [-1, n_cats)
+        n_cats (int): Number of distinct codes
+        k (int): Number of codes to return
+        
+    Returns:
+        tuple: Codes and their counts, most frequent first
+    """
+    counts = np.bincount(codes[codes >= 0], minlength=n_cats)
+    if n_cats > k:
+        kth_count = np.partition(counts, n_cats - k)[n_cats - k]
+        above = np.flatnonzero(counts > kth_count)
+        ties = np.flatnonzero(counts == kth_count)[:k - len(above)]
+        top = np.sort(np.concatenate([above, ties]))
+    else:
+        top = np.arange(n_cats)
+    top = top[np.argsort(-counts[top], kind='stable')]
+    return top, counts[top]
+
+
+def _top_counts(series: pd.Series, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Find the k most frequent values of a column.
+    
+    Values are hashed to integer codes once with pd.factorize, so ties keep
+    the order of first appearance; categorical columns reuse their codes.
+    Missing values are ignored.
+    
+    Args:
+        series (pd.Series): Column to count
+        k (int): Number of values to return
+        
+    Returns:
+        tuple: Values and their counts, most frequent first
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        # Already integer-coded; unused categories are kept with a zero count
+        codes = series.cat.codes.to_numpy()
+        uniques = series.cat.categories
+    else:
+        codes, uniques = pd.factorize(series)
+    top, counts = _topk_counts(codes, len(uniques), k)
+    return np.asarray(uniques)[top], counts
+
+
+def _sample_rows(n_rows: int, max_points: Optional[int]) -> Optional[np.ndarray]:
+    """
+    Pick the rows to draw when a chart has more than max_points rows.
+    
+    The sample is seeded so the same figure is drawn on every call, and
+    sorted so line charts keep their original row order.
+    
+    Args:
+        n_rows (int): Number of rows in the DataFrame
+        max_points (int, optional): Maximum rows to draw; None draws all of them
+        
+    Returns:
+        np.ndarray: Sorted row positions, or None if every row is drawn
+    """
+    if max_points is None or n_rows <= max_points:
+        return None
+    rows = np.random.default_rng(0).choice(n_rows, max_points, replace=False)
+    rows.sort()
+    return rows
+
+
+def _take(series: pd.Series, rows: Optional[np.ndarray]) -> pd.Series:
+    """Select sampled rows from a column; None keeps the whole column."""
+    return series if rows is None else series.take(rows)
+
+
+def _box_stats(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Compute the statistics Plotly draws for one box.
+    
+    Quartiles are interpolated at position p * n - 0.5 (the 'hazen' method),
+    matching Plotly.js's default quartilemethod='linear'; the whiskers reach
+    the furthest values within 1.5 IQR of the box, as Plotly draws them.
+    
+    Args:
+        values (np.ndarray): Sorted 1D float array without NaNs
+        
+    Returns:
+        tuple: [q1, median, q3, lowerfence, upperfence] and the outlying values
+    """
+    q1, median, q3 = np.percentile(values, [25, 50, 75], method='hazen')
+    iqr = q3 - q1
+    lo = np.searchsorted(values, q1 - 1.5 * iqr, side='left')
+    hi = np.searchsorted(values, q3 + 1.5 * iqr, side='right')
+    stats = np.array([q1, median, q3, values[lo], values[hi - 1]])
+    return stats, np.concatenate([values[:lo], values[hi:]])
+
+
+def _scatter_type(n_points: int) -> str:
+    """Use the WebGL scatter trace for large point counts, SVG otherwise."""
+    return 'scattergl' if n_points > WEBGL_THRESHOLD else 'scatter'
+
+
+def _demote(values: np.ndarray) -> np.ndarray:
+    """
+    Convert float64 plot data to float32 when the rounding cannot be seen.
+    
+    float32 halves the size of the encoded figure, but keeps only about seven
+    significant digits: timestamps or large prices with small differences
+    collapse onto the same values. The conversion is kept only if no finite
+    value moves by more than DISPLAY_TOLERANCE of the data's range.
+    
+    Args:
+        values (np.ndarray): 1D float64 array, possibly with NaNs
+        
+    Returns:
+        np.ndarray: float32 copy of values, or values itself
+    """
+    with np.errstate(over='ignore', invalid='ignore'):
+        demoted = values.astype(np.float32)
+        finite = np.isfinite(values)
+        if not finite.any():
+            return demoted
+        error = np.abs(demoted[finite] - values[finite]).max()
+    if error <= DISPLAY_TOLERANCE * np.ptp(values[finite]):
+        return demoted
+    return values
+
+
+def _as_f32(series: pd.Series) -> np.ndarray:
+    """
+    Extract a column for plotting, demoting float64 to float32 where safe.
+    
+    Plotly.js draws from Float32Array anyway, so float64 only doubles the
+    size of the encoded figure; see _demote for when precision requires it.
+    Other dtypes keep their type, as a contiguous array so Plotly can
+    base64-encode it directly; columns of a frame wrapping a 2D array
+    without copying are strided views otherwise.
+    """
+    if is_float_dtype(series.dtype) and series.dtype != np.float32:
+        return _demote(series.to_numpy(dtype=np.float64, na_value=np.nan))
+    return np.ascontiguousarray(series.to_numpy())
+
+
+def _is_numeric(dtype) -> bool:
+    """Check whether a column dtype holds numbers (booleans excluded)."""
+    return is_numeric_dtype(dtype) and not is_bool_dtype(dtype)
 
 
 class JSONVisualizer:
@@ -16,11 +266,33 @@ class JSONVisualizer:
             df (pd.DataFrame): DataFrame to visualize
         """
         self.df = df
+        self._df_version = 0
+        self._fig_cache = OrderedDict()
+        self._fig_lock = threading.Lock()
+        self.refresh()
+    
+    def refresh(self) -> None:
+        """
+        Drop cached figures and column information.
+        
+        Call this after modifying the DataFrame in place.
+        """
+        with self._fig_lock:
+            self._df_version += 1
+            self._fig_cache.clear()
+        # Computed once so repeated plot calls skip dtype inspection and Index lookups
+        self._dtypes = self.df.dtypes.to_dict()
+        self._column_set = frozenset(self._dtypes)
+        self._numeric_df = self.df.select_dtypes(include=[np.number])
+        self._numeric_cols = frozenset(self._numeric_df.columns)
     
+    @_cached_figure
     def create_histogram(self, column: str, title: Optional[str] = None) -> go.Figure:
         """
         Create a histogram for a numeric column.
         
+        Non-numeric columns are drawn as a bar chart of their most frequent values.
+        
         Args:
             column (str): Column name to plot
             title (str, optional): Plot title
@@ -28,15 +300,33 @@ class JSONVisualizer:
         Returns:
             go.Figure: Plotly figure object
         """
-        if column not in self.df.columns:
+        if column not in self._column_set:
             raise ValueError(f"Column '{column}' not found in DataFrame")
-        
+            
         if title is None:
             title = f'Distribution of {column}'
             
-        fig = px.histogram(self.df, x=column, title=title)
-        return fig
+        if not _is_numeric(self._dtypes[column]):
+            return self.create_bar_chart(column, title=title)
+            
+        # Bin in NumPy so only the bin counts are sent to the browser
+        values = self.df[column].to_numpy(dtype=np.float64, na_value=np.nan)
+        values = values[~np.isnan(values)]
+        if (is_integer_dtype(self._dtypes[column]) and values.size
+                and np.ptp(values) < MAX_HISTOGRAM_BINS):
+            # One bin per integer, centered on it, as Plotly's autobin does
+            bins = np.arange(values.min(), values.max() + 2) - 0.5
+        else:
+            bins = _histogram_bin_count(values)
+        counts, edges = np.histogram(values, bins=bins)
+        return _figure(
+            [{'type': 'bar', 'x': (edges[:-1] + edges[1:]) / 2, 'y': counts,
+              'width': np.diff(edges)}],
+            {'title': {'text': title}, 'bargap': 0,
+             'xaxis': {'title': {'text': column}}, 'yaxis': {'title': {'text': 'count'}}}
+        )
     
+    @_cached_figure
     def create_bar_chart(self, column: str, title: Optional[str] = None) -> go.Figure:
         """
         Create a bar chart for a categorical column.
@@ -48,21 +338,24 @@ class JSONVisualizer:
         Returns:
             go.Figure: Plotly figure object
         """
-        if column not in self.df.columns:
+        if column not in self._column_set:
             raise ValueError(f"Column '{column}' not found in DataFrame")
-        
+            
         if title is None:
             title = f'Count of {column}'
-        
-        value_counts = self.df[column].value_counts().head(20)  # Limit to top 20
-        fig = px.bar(x=value_counts.index, y=value_counts.values, title=title)
-        fig.update_xaxes(title_text=column)
-        fig.update_yaxes(title_text='Count')
-        return fig
+            
+        values, counts = _top_counts(self.df[column], 20)  # Limit to top 20
+        return _figure(
+            [{'type': 'bar', 'x': values, 'y': counts}],
+            {'title': {'text': title},
+             'xaxis': {'title': {'text': column}}, 'yaxis': {'title': {'text': 'Count'}}}
+        )
     
-    def create_scatter_plot(self, x_column: str, y_column: str, 
+    @_cached_figure
+    def create_scatter_plot(self, x_column: str, y_column: str,
                            color_column: Optional[str] = None,
-                           title: Optional[str] = None) -> go.Figure:
+                           title: Optional[str] = None,
+                           max_points: Optional[int] = MAX_POINTS) -> go.Figure:
         """
         Create a scatter plot for two numeric columns.
         
@@ -71,30 +364,62 @@ class JSONVisualizer:
             y_column (str): Column name for y-axis
             color_column (str, optional): Column name for color coding
             title (str, optional): Plot title
+            max_points (int, optional): Draw a random sample of at most this
+                many rows; None draws every row
             
         Returns:
             go.Figure: Plotly figure object
         """
-        if x_column not in self.df.columns:
+        if x_column not in self._column_set:
             raise ValueError(f"Column '{x_column}' not found in DataFrame")
-        if y_column not in self.df.columns:
+        if y_column not in self._column_set:
             raise ValueError(f"Column '{y_column}' not found in DataFrame")
-        
+            
         if title is None:
             title = f'{y_column} vs {x_column}'
             
-        if color_column and color_column in self.df.columns:
-            fig = px.scatter(self.df, x=x_column, y=y_column, color=color_column, title=title)
+        # Extract every column up front, once
+        df = self.df
+        rows = _sample_rows(len(df), max_points)
+        x = _as_f32(_take(df[x_column], rows))
+        y = _as_f32(_take(df[y_column], rows))
+        has_color = bool(color_column) and color_column in self._column_set
+        color = _take(df[color_column], rows) if has_color else None
+        trace_type = _scatter_type(len(x))
+        layout = {'title': {'text': title},
+                  'xaxis': {'title': {'text': x_column}}, 'yaxis': {'title': {'text': y_column}}}
+                  
+        if has_color:
+            if _is_numeric(self._dtypes[color_column]):
+                data = [{'type': trace_type, 'mode': 'markers', 'x': x, 'y': y,
+                         'marker': {'color': _as_f32(color), 'showscale': True,
+                                    'colorbar': {'title': {'text': color_column}}}}]
+            else:
+                # One trace per category so each gets its own legend entry
+                # Rows without a colour value are left out, as plotly.express does
+                codes, categories = pd.factorize(color)
+                order = np.argsort(codes, kind='stable')
+                bounds = np.searchsorted(codes[order], np.arange(len(categories) + 1))
+                data = []
+                for i, category in enumerate(categories):
+                    members = order[bounds[i]:bounds[i + 1]]
+                    data.append({'type': trace_type, 'mode': 'markers', 'name': str(category),
+                                 'x': x[members], 'y': y[members]})
+                layout['legend'] = {'title': {'text': color_column}}
         else:
-            fig = px.scatter(self.df, x=x_column, y=y_column, title=title)
+            data = [{'type': trace_type, 'mode': 'markers', 'x': x, 'y': y}]
             
-        return fig
+        return _figure(data, layout)
     
+    @_cached_figure
     def create_box_plot(self, column: str, group_column: Optional[str] = None,
                        title: Optional[str] = None) -> go.Figure:
         """
         Create a box plot for a numeric column.
         
+        Quartiles, whiskers and outliers are computed here, so only those are
+        sent to the browser rather than every value.
+        
         Args:
             column (str): Column name to plot
             group_column (str, optional): Column name to group by
@@ -103,19 +428,65 @@ class JSONVisualizer:
         Returns:
             go.Figure: Plotly figure object
         """
-        if column not in self.df.columns:
+        if column not in self._column_set:
             raise ValueError(f"Column '{column}' not found in DataFrame")
-        
+            
         if title is None:
             title = f'Box plot of {column}'
             
-        if group_column and group_column in self.df.columns:
-            fig = px.box(self.df, y=column, x=group_column, title=title)
+        if not _is_numeric(self._dtypes[column]):
+            raise ValueError(f"Column '{column}' is not numeric")
+            
+        df = self.df
+        values = df[column].to_numpy(dtype=np.float64, na_value=np.nan)
+        by = df[group_column] if group_column and group_column in self._column_set else None
+        layout = {'title': {'text': title}, 'yaxis': {'title': {'text': column}},
+                  'showlegend': False}
+        if by is not None:
+            codes, groups = pd.factorize(by)
+            keep = (codes >= 0) & ~np.isnan(values)
+            codes, values = codes[keep], values[keep]
+            # Sort by group, then by value, so each group is a sorted slice
+            order = np.lexsort((values, codes))
+            codes, values = codes[order], values[order]
+            bounds = np.searchsorted(codes, np.arange(len(groups) + 1))
+            layout['xaxis'] = {'title': {'text': group_column}}
         else:
-            fig = px.box(self.df, y=column, title=title)
+            values = np.sort(values[~np.isnan(values)])
+            groups = [column]
+            bounds = [0, len(values)]
+            
+        labels, stats, outlier_x, outlier_y = [], [], [], []
+        for i, group in enumerate(groups):
+            group_values = values[bounds[i]:bounds[i + 1]]
+            if not group_values.size:
+                continue
+            group_stats, outliers = _box_stats(group_values)
+            labels.append(group)
+            stats.append(group_stats)
+            outlier_x.append(np.repeat(np.asarray([group], dtype=object), outliers.size))
+            outlier_y.append(outliers)
+            
+        # One contiguous row per statistic rather than strided columns
+        stats = np.ascontiguousarray(np.array(stats).reshape(-1, 5).T)
+        labels = np.asarray(labels, dtype=object)
+        outlier_x = np.concatenate(outlier_x) if outlier_x else np.array([], dtype=object)
+        outlier_y = np.concatenate(outlier_y) if outlier_y else np.array([])
+        rows = _sample_rows(len(outlier_y), MAX_POINTS)
+        if rows is not None:
+            outlier_x, outlier_y = outlier_x[rows], outlier_y[rows]
             
-        return fig
+        color = '#636efa'  # Plotly's first default trace colour, shared by the outliers
+        return _figure(
+            [{'type': 'box', 'x': labels, 'q1': stats[0], 'median': stats[1],
+              'q3': stats[2], 'lowerfence': stats[3], 'upperfence': stats[4],
+              'line': {'color': color}},
+             {'type': 'scatter', 'mode': 'markers', 'x': outlier_x,
+              'y': _demote(outlier_y), 'marker': {'color': color, 'size': 4}}],
+            layout
+        )
     
+    @_cached_figure
     def create_correlation_heatmap(self, columns: Optional[List[str]] = None,
                                   title: Optional[str] = None) -> go.Figure:
         """
@@ -129,22 +500,38 @@ class JSONVisualizer:
             go.Figure: Plotly figure object
         """
         if columns:
-            numeric_df = self.df[columns].select_dtypes(include=[np.number])
+            for column in columns:
+                if column not in self._column_set:
+                    raise ValueError(f"Column '{column}' not found in DataFrame")
+            numeric_df = self._numeric_df[[column for column in columns if column in self._numeric_cols]]
         else:
-            numeric_df = self.df.select_dtypes(include=[np.number])
-        
+            numeric_df = self._numeric_df
+            
         if numeric_df.empty or len(numeric_df.columns) < 2:
             raise ValueError("Not enough numeric columns for correlation heatmap")
-        
+            
         if title is None:
             title = 'Correlation Heatmap'
-        
-        corr_matrix = numeric_df.corr()
-        fig = px.imshow(corr_matrix, text_auto=True, title=title)
-        return fig
+            
+        values = numeric_df.to_numpy(dtype=np.float64, na_value=np.nan)
+        corr_matrix = pearson_correlation(values, dtype=np.float32)
+        labels = list(numeric_df.columns)
+        trace = {'type': 'heatmap', 'z': corr_matrix, 'x': labels, 'y': labels,
+                 'colorscale': 'RdBu', 'zmid': 0}
+        if len(labels) <= HEATMAP_TEXT_LIMIT:
+            # Formatted in the browser from z, so no text array is sent
+            trace['texttemplate'] = '%{z:.2f}'
+        return _figure(
+            [trace],
+            {'title': {'text': title},
+             'xaxis': {'constrain': 'domain'},
+             'yaxis': {'autorange': 'reversed', 'constrain': 'domain'}}
+        )
     
+    @_cached_figure
     def create_line_chart(self, x_column: str, y_column: str,
-                         title: Optional[str] = None) -> go.Figure:
+                         title: Optional[str] = None,
+                         max_points: Optional[int] = MAX_POINTS) -> go.Figure:
         """
         Create a line chart for two columns.
         
@@ -152,21 +539,31 @@ class JSONVisualizer:
             x_column (str): Column name for x-axis
             y_column (str): Column name for y-axis
             title (str, optional): Plot title
+            max_points (int, optional): Draw a random sample of at most this
+                many rows, kept in row order; None draws every row
             
         Returns:
             go.Figure: Plotly figure object
         """
-        if x_column not in self.df.columns:
+        if x_column not in self._column_set:
             raise ValueError(f"Column '{x_column}' not found in DataFrame")
-        if y_column not in self.df.columns:
+        if y_column not in self._column_set:
             raise ValueError(f"Column '{y_column}' not found in DataFrame")
-        
+            
         if title is None:
             title = f'{y_column} over {x_column}'
             
-        fig = px.line(self.df, x=x_column, y=y_column, title=title)
-        return fig
+        df = self.df
+        rows = _sample_rows(len(df), max_points)
+        x = _as_f32(_take(df[x_column], rows))
+        y = _as_f32(_take(df[y_column], rows))
+        return _figure(
+            [{'type': _scatter_type(len(x)), 'mode': 'lines', 'x': x, 'y': y}],
+            {'title': {'text': title},
+             'xaxis': {'title': {'text': x_column}}, 'yaxis': {'title': {'text': y_column}}}
+        )
     
+    @_cached_figure
     def create_pie_chart(self, column: str, title: Optional[str] = None) -> go.Figure:
         """
         Create a pie chart for a categorical column.
@@ -178,12 +575,14 @@ class JSONVisualizer:
         Returns:
             go.Figure: Plotly figure object
         """
-        if column not in self.df.columns:
+        if column not in self._column_set:
             raise ValueError(f"Column '{column}' not found in DataFrame")
-        
+            
         if title is None:
             title = f'Distribution of {column}'
-        
-        value_counts = self.df[column].value_counts().head(15)  # Limit to top 15
-        fig = px.pie(values=value_counts.values, names=value_counts.index, title=title)
-        return fig
\ No newline at end of file
+            
+        values, counts = _top_counts(self.df[column], 15)  # Limit to top 15
+        return _figure(
+            [{'type': 'pie', 'labels': values, 'values': counts}],
+            {'title': {'text': title}}
+        )